@@ -1,36 +1,89 @@
-from fastapi import APIRouter, HTTPException
+import logging
+from typing import Any, Dict, Optional
 
+from fastapi import APIRouter, Header, HTTPException, Response
+
+from app.core.config import settings
+from app.core.profiling import RequestProfiler, profiling_requested
 from app.models.schemas import RecommendRequest, RecommendResponse
+from app.services.cursor_store import InvalidCursorError, MalformedCursorError
 from app.services.recommendation import recommendation_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
-@router.post("/recommend", response_model=RecommendResponse)
-async def get_recommendations(request: RecommendRequest):
-    """
-    Get module recommendations based on student profile.
-    """
+def _run_recommendation(request: RecommendRequest) -> Dict[str, Any]:
+    if request.cursor:
+        return recommendation_service.get_recommendations_page(
+            cursor=request.cursor,
+            top_n=request.k
+        )
+
+    # Get recommendations using individual fields directly
+    return recommendation_service.get_recommendations(
+        study_program=request.study_program,
+        interests=request.interests,
+        skills=request.skills,
+        favorites=request.favorites,
+        top_n=request.k,
+        location=request.study_location,
+        study_credit=request.study_credit,
+        level=request.level
+    )
+
+def _recommend(request: RecommendRequest) -> RecommendResponse:
+    """Run the recommendation and map service errors to HTTP errors."""
     try:
         if not recommendation_service.is_ready():
             raise HTTPException(status_code=500, detail="Recommendation service not initialized")
         
-        # Get recommendations using individual fields directly
-        result = recommendation_service.get_recommendations(
-            study_program=request.study_program,
-            interests=request.interests,
-            skills=request.skills,
-            favorites=request.favorites,
-            top_n=request.k,
-            location=request.study_location,
-            study_credit=request.study_credit,
-            level=request.level
-        )
-        
-        return RecommendResponse(**result)
+        return RecommendResponse(**_run_recommendation(request))
         
     except HTTPException:
         raise
+    except MalformedCursorError as e:
+        raise HTTPException(status_code=400, detail=f"Malformed cursor: {str(e)}")
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=410, detail=f"Invalid cursor: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting recommendations: {str(e)}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting recommendations: {str(e)}")
\ No newline at end of file
+
+def _write_profile(profiler: RequestProfiler) -> Optional[str]:
+    """Write the profile; a failing write must never affect the request itself."""
+    try:
+        return profiler.write(settings.PROFILING_OUTPUT_DIR)
+    except OSError as e:
+        logger.warning(f"Failed to write profile to {settings.PROFILING_OUTPUT_DIR}: {e}")
+        return None
+
+@router.post("/recommend", response_model=RecommendResponse)
+async def get_recommendations(
+    request: RecommendRequest,
+    response: Response,
+    x_profile_token: Optional[str] = Header(None)
+):
+    """
+    Get module recommendations based on student profile.
+    Pass the returned next_cursor to fetch the following page of the same ranking.
+    """
+    if not profiling_requested(x_profile_token):
+        return _recommend(request)
+
+    profiler = RequestProfiler("POST /api/recommend")
+    try:
+        with profiler:
+            result = _recommend(request)
+    except HTTPException as e:
+        # Failing requests are the interesting ones, so they carry the profile id too
+        profile_id = _write_profile(profiler)
+        if profile_id is None:
+            raise
+        headers = dict(e.headers or {})
+        headers["X-Profile-Id"] = profile_id
+        raise HTTPException(status_code=e.status_code, detail=e.detail, headers=headers) from e
+
+    profile_id = _write_profile(profiler)
+    if profile_id is not None:
+        response.headers["X-Profile-Id"] = profile_id
+    return result
\ No newline at end of file
@@ -22,4 +22,16 @@ class Settings:
     DEFAULT_TOP_N = 5
     MAX_TOP_N = 20
 
+    # Cursor pagination: ranked results are kept in memory for follow-up pages
+    CURSOR_TTL_SECONDS = int(os.getenv("CURSOR_TTL_SECONDS", "600"))
+    CURSOR_MAX_ENTRIES = int(os.getenv("CURSOR_MAX_ENTRIES", "1000"))
+
+    # Per-request profiling: only active when enabled here AND the request sends
+    # a matching X-Profile-Token header. Stack samples are written as collapsed stacks.
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_OUTPUT_DIR = os.getenv("PROFILING_OUTPUT_DIR", "profiles")
+    # Floor of 0.5 ms: lower values make the sampler thread busy-loop and fight the request for the GIL
+    PROFILING_SAMPLE_INTERVAL_MS = max(float(os.getenv("PROFILING_SAMPLE_INTERVAL_MS", "5")), 0.5)
+
 settings = Settings()
\ No newline at end of file
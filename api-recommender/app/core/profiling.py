@@ -0,0 +1,83 @@
+# Opt-in per-request profiling
+import hmac
+import os
+import sys
+import threading
+import uuid
+from collections import Counter
+from typing import Optional
+
+from app.core.config import settings
+
+
+def profiling_requested(token: Optional[str]) -> bool:
+    """Return True if profiling is enabled in config and the admin token matches."""
+    if not settings.PROFILING_ENABLED or not settings.PROFILING_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), settings.PROFILING_TOKEN.encode())
+
+
+class RequestProfiler:
+    """Sample the current thread's Python stack from a background thread.
+
+    Samples are aggregated as collapsed stacks ("outer;inner count" per line),
+    which speedscope (https://www.speedscope.app) and flamegraph.pl read directly.
+    No profiling hook is installed, so debuggers or coverage on the thread are
+    left untouched.
+    """
+
+    def __init__(self, name: str, interval: Optional[float] = None):
+        self.name = name
+        self.interval = interval if interval is not None else settings.PROFILING_SAMPLE_INTERVAL_MS / 1000
+        self.samples: Counter = Counter()
+        self._target_id = None
+        self._root = None
+        self._stop = threading.Event()
+        self._sampler = None
+
+    @staticmethod
+    def _label(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def _sample(self):
+        frame = sys._current_frames().get(self._target_id)
+        stack = []
+        # Walk up to the frame that started profiling, skipping the event loop above it
+        while frame is not None:
+            stack.append(self._label(frame))
+            if frame is self._root:
+                break
+            frame = frame.f_back
+        if stack:
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "RequestProfiler":
+        self._target_id = threading.get_ident()
+        self._root = sys._getframe(1)
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._sampler.join()
+        self._root = None
+        return False
+
+    def to_collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def write(self, output_dir: str) -> str:
+        """Write the collapsed stacks to output_dir and return the profile id."""
+        profile_id = uuid.uuid4().hex
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"{profile_id}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_collapsed())
+        return profile_id
@@ -10,6 +10,7 @@ class RecommendRequest(BaseModel):
     study_credit: Optional[int] = Field(None, description="Gewenste studiepunten")
     level: Optional[str] = Field(None, description="Gewenst niveau (bijv. NLQF5)")
     k: int = Field(5, description="Aantal aanbevelingen", ge=1, le=20)
+    cursor: Optional[str] = Field(None, description="Cursor van een vorige response voor de volgende pagina; profielvelden worden dan genegeerd")
 
 class RecommendItem(BaseModel):
     id: int
@@ -27,6 +28,7 @@ class RecommendItem(BaseModel):
 class RecommendResponse(BaseModel):
     recommendations: List[RecommendItem]
     total_found: int = Field(..., description="Aantal gevonden aanbevelingen")
+    next_cursor: Optional[str] = Field(None, description="Cursor voor de volgende pagina, of null als er geen meer zijn")
 
 class HealthResponse(BaseModel):
     status: str
@@ -0,0 +1,92 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+
+class InvalidCursorError(Exception):
+    """Raised when a cursor is unknown, expired or belongs to an older model."""
+
+
+class MalformedCursorError(Exception):
+    """Raised when a cursor cannot be parsed or points outside its ranking."""
+
+
+@dataclass
+class RankedResult:
+    """Full ranking of one recommendation request, kept for follow-up pages."""
+    order: np.ndarray  # int32 row positions, best match first
+    scores: np.ndarray  # float32 hybrid scores, aligned with order
+    student_vec: object  # sparse TF-IDF vector of the student profile
+    generation: int
+    created_at: float
+
+
+class RankedResultStore:
+    """Bounded, TTL-evicted in-memory store for ranked results.
+
+    Cursors have the form "<token>:<offset>"; clients should treat them as opaque.
+    The store is per process: with several workers (e.g. gunicorn -w N) a cursor
+    only resolves on the worker that created it, so run a single worker or use
+    sticky routing.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, RankedResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict_expired(self, now: float):
+        while self._entries:
+            token, entry = next(iter(self._entries.items()))
+            if now - entry.created_at < self.ttl_seconds:
+                break
+            del self._entries[token]
+
+    def put(self, result: RankedResult) -> str:
+        """Store a ranked result and return its token."""
+        token = secrets.token_urlsafe(16)
+        with self._lock:
+            self._evict_expired(result.created_at)
+            self._entries[token] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return token
+
+    def get(self, token: str, generation: int) -> RankedResult:
+        """Look up a ranked result, rejecting expired or stale entries."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._entries.get(token)
+            if entry is None:
+                raise InvalidCursorError("Cursor is unknown or has expired")
+            if entry.generation != generation:
+                del self._entries[token]
+                raise InvalidCursorError("Cursor belongs to an older model generation")
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def encode_cursor(token: str, offset: int) -> str:
+        return f"{token}:{offset}"
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, int]:
+        token, sep, offset = cursor.rpartition(":")
+        # isdigit() alone also accepts Unicode digits such as "²" that int() rejects
+        if not sep or not token or not (offset.isascii() and offset.isdigit()):
+            raise MalformedCursorError("Malformed cursor")
+        return token, int(offset)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
@@ -4,6 +4,7 @@ import os
 import numpy as np
 import pandas as pd
 import random
+import time
 import joblib
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
@@ -12,6 +13,7 @@ import nltk
 from nltk.corpus import stopwords
 
 from app.core.config import settings
+from app.services.cursor_store import MalformedCursorError, RankedResult, RankedResultStore
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,6 +24,12 @@ class RecommendationService:
         self.vectorizer = None
         self.X = None
         self.feature_names = None
+        # Bumped on every (re)load so cursors from an older model become invalid
+        self.generation = 0
+        self.result_store = RankedResultStore(
+            max_entries=settings.CURSOR_MAX_ENTRIES,
+            ttl_seconds=settings.CURSOR_TTL_SECONDS,
+        )
         self._initialize_stopwords()
 
     def _initialize_stopwords(self):
@@ -238,6 +246,7 @@ class RecommendationService:
                 self.X = cached["X"]
                 self.feature_names = cached["feature_names"]
                 logger.info(f"Loaded recommender cache from {cache_path}")
+                self._start_new_generation()
                 return
             except Exception as e:
                 logger.warning(f"Failed to load cache from {cache_path}, rebuilding. Error: {e}")
@@ -268,6 +277,7 @@ class RecommendationService:
         
         self.X = self.vectorizer.fit_transform(self.df["clean_text"])
         self.feature_names = self.vectorizer.get_feature_names_out()
+        self._start_new_generation()
 
         if cache_path:
             try:
@@ -288,6 +298,11 @@ class RecommendationService:
             except Exception as e:
                 logger.warning(f"Failed to write cache to {cache_path}: {e}")
 
+    def _start_new_generation(self):
+        """Invalidate all outstanding cursors after the model changed."""
+        self.generation += 1
+        self.result_store.clear()
+
     def get_recommendations(
         self,
         study_program: Optional[str] = None,
@@ -390,48 +405,98 @@ class RecommendationService:
 
         # Keep hybrid score as final similarity (no normalization)
         # This preserves the effect of location/credit/level preferences
-        df_work["similarity"] = df_work["hybrid_score"]
+        hybrid_scores = df_work["hybrid_score"].to_numpy()
+
+        # Rank all modules once; a stable sort keeps the order reproducible across pages
+        order = np.argsort(-hybrid_scores, kind="stable").astype(np.int32)
+        scores = hybrid_scores[order].astype(np.float32)
+
+        next_cursor = None
+        if len(order) > top_n:
+            token = self.result_store.put(RankedResult(
+                order=order,
+                scores=scores,
+                student_vec=student_vec,
+                generation=self.generation,
+                created_at=time.monotonic(),
+            ))
+            next_cursor = RankedResultStore.encode_cursor(token, top_n)
+
+        # The first page uses the exact float64 scores; float32 is only for the stored ranking
+        first_page = order[:top_n]
+        recommendations = self._build_recommendations(first_page, hybrid_scores[first_page], student_vec)
+
+        return {
+            "recommendations": recommendations,
+            "total_found": len(recommendations),
+            "next_cursor": next_cursor
+        }
+
+    def get_recommendations_page(self, cursor: str, top_n: int = 5) -> Dict[str, Any]:
+        """
+        Get the next page of a previous ranking without re-scoring the catalog.
+        Raises MalformedCursorError for unparseable or out-of-range cursors and
+        InvalidCursorError for unknown, expired or stale ones.
+        """
+        if self.df is None or self.vectorizer is None or self.X is None:
+            raise ValueError("Model not initialized. Call load_dataset first.")
 
-        # Sort by hybrid score and get top N
-        top = df_work.sort_values("hybrid_score", ascending=False).head(top_n)
+        token, offset = RankedResultStore.decode_cursor(cursor)
+        ranked = self.result_store.get(token, self.generation)
+        if offset > len(ranked.order):
+            raise MalformedCursorError("Cursor offset out of range")
 
-        # Generate recommendations with match terms and reasons
+        end = offset + top_n
+        recommendations = self._build_recommendations(
+            ranked.order[offset:end], ranked.scores[offset:end], ranked.student_vec
+        )
+        next_cursor = RankedResultStore.encode_cursor(token, end) if end < len(ranked.order) else None
+
+        return {
+            "recommendations": recommendations,
+            "total_found": len(recommendations),
+            "next_cursor": next_cursor
+        }
+
+    def _build_recommendations(self, positions: np.ndarray, scores: np.ndarray, student_vec) -> List[Dict[str, Any]]:
+        """Generate recommendations with match terms and reasons for a slice of the ranking."""
         recommendations = []
-        for idx in top.index:
+        for pos, score in zip(positions, scores):
+            pos = int(pos)
+            score = float(score)
+            row = self.df.iloc[pos]
+
             # Get module vector for this specific module
-            module_vec = self.X[idx]
+            module_vec = self.X[pos]
 
             terms = self.extract_match_terms(student_vec, module_vec)
             reason = self.build_reason(
                 terms,
-                module_name=top.at[idx, "name"],
-                score=top.at[idx, "similarity"]
+                module_name=row["name"],
+                score=score
             )
             reason_en = self.build_reason_en(
                 terms,
-                module_name=top.at[idx, "name"],
-                score=top.at[idx, "similarity"]
+                module_name=row["name"],
+                score=score
             )
-            
+
             recommendation = {
-                "id": int(top.at[idx, "id"]),
-                "name": str(top.at[idx, "name"]),
-                "shortdescription": str(top.at[idx, "shortdescription"]),
-                "similarity": float(top.at[idx, "hybrid_score"]),  # Show hybrid score instead of normalized
-                "location": str(top.at[idx, "location"]),
-                "study_credit": int(top.at[idx, "studycredit"]),
-                "level": str(top.at[idx, "level"]),
-                "module_tags": str(top.at[idx, "module_tags"]) if pd.notna(top.at[idx, "module_tags"]) else "",
+                "id": int(row["id"]),
+                "name": str(row["name"]),
+                "shortdescription": str(row["shortdescription"]),
+                "similarity": score,  # Show hybrid score instead of normalized
+                "location": str(row["location"]),
+                "study_credit": int(row["studycredit"]),
+                "level": str(row["level"]),
+                "module_tags": str(row["module_tags"]) if pd.notna(row["module_tags"]) else "",
                 "match_terms": terms,
                 "reason": reason,
                 "reason_en": reason_en
             }
             recommendations.append(recommendation)
 
-        return {
-            "recommendations": recommendations, 
-            "total_found": len(recommendations)
-        }
+        return recommendations
 
     def is_ready(self) -> bool:
         """Check if service is ready."""